@@ -2,7 +2,7 @@
 from . import meta
 from .afm_group import AFMGroup
 from .afm_qmap import AFMQMap
-from .formats import find_data, load_data
+from .formats import find_data, load_data, load_data_iter
 from .formats import supported_extensions
 from .mod_creep_compliance import AFMCreepCompliance
 from .mod_force_distance import AFMForceDistance
@@ -1,4 +1,5 @@
 import pathlib
+import types
 
 from .. import errors
 from .. import meta
@@ -14,8 +15,9 @@ from ..mod_creep_compliance import AFMCreepCompliance
 
 
 __all__ = ["AFMFormatRecipe", "find_data", "get_recipe", "load_data",
-           "default_data_classes_by_modality", "formats_available",
-           "formats_by_suffix", "formats_by_modality", "supported_extensions"]
+           "load_data_iter", "default_data_classes_by_modality",
+           "formats_available", "formats_by_suffix", "formats_by_modality",
+           "supported_extensions"]
 
 
 class AFMFormatRecipe(object):
@@ -201,6 +203,26 @@ def get_recipe(path, modality=None):
     return rec
 
 
+def _iter_data(path, cur_recipe, modality, fix_modality, afm_data_class,
+               meta_override, diskcache, callback):
+    """Generator that yields one AFMData instance per curve
+
+    All arguments must already be resolved (see :func:`load_data_iter`),
+    so that errors such as an unsupported file extension are raised
+    eagerly and not deferred to the first iteration.
+    """
+    for dd in cur_recipe.loader(path, callback=callback,
+                                meta_override=meta_override):
+        dd["metadata"]["format"] = "{} ({})".format(cur_recipe["maker"],
+                                                    cur_recipe["descr"])
+        if fix_modality and dd["metadata"]["imaging mode"] != modality:
+            # The user explicitly requested this modality.
+            continue
+        yield afm_data_class(data=dd["data"],
+                             metadata=dd["metadata"],
+                             diskcache=diskcache)
+
+
 def load_data(path, meta_override=None, modality=None,
               data_classes_by_modality=None, diskcache=False,
               callback=None):
@@ -230,39 +252,56 @@ def load_data(path, meta_override=None, modality=None,
     -------
     afm_list: list of afmformats.afm_data.AFMData
         List where each element is on AFMData curve
+
+    See Also
+    --------
+    load_data_iter: Iterator version of this function
+    """
+    return list(load_data_iter(
+        path,
+        meta_override=meta_override,
+        modality=modality,
+        data_classes_by_modality=data_classes_by_modality,
+        diskcache=diskcache,
+        callback=callback))
+
+
+def load_data_iter(path, meta_override=None, modality=None,
+                   data_classes_by_modality=None, diskcache=False,
+                   callback=None):
+    """Iterate over AFM data, one curve at a time
+
+    This is the streaming counterpart of :func:`load_data` (which
+    takes the same parameters). Instead of materializing all curves
+    of a file up-front, the curves are yielded one by one, so the
+    memory footprint stays bounded e.g. when processing force maps
+    with thousands of curves sequentially.
     """
     if meta_override is None:
         meta_override = {}
     if data_classes_by_modality is None:
         data_classes_by_modality = {}
     path = pathlib.Path(path)
-    if path.suffix in formats_by_suffix:
-        afmdata = []
-        cur_recipe = get_recipe(path, modality=modality)
-        loader = cur_recipe.loader
-        if modality is None:
-            modality = cur_recipe.get_modality(path)
-            fix_modality = False
-        else:
-            fix_modality = True
-        if modality in data_classes_by_modality:
-            afm_data_class = data_classes_by_modality[modality]
-        else:
-            afm_data_class = default_data_classes_by_modality[modality]
-        for dd in loader(path, callback=callback,
-                         meta_override=meta_override):
-            dd["metadata"]["format"] = "{} ({})".format(cur_recipe["maker"],
-                                                        cur_recipe["descr"])
-            if fix_modality and dd["metadata"]["imaging mode"] != modality:
-                # The user explicitly requested this modality.
-                continue
-            ddi = afm_data_class(data=dd["data"],
-                                 metadata=dd["metadata"],
-                                 diskcache=diskcache)
-            afmdata.append(ddi)
-    else:
+    if path.suffix not in formats_by_suffix:
         raise ValueError("Unsupported file extension: '{}'!".format(path))
-    return afmdata
+    cur_recipe = get_recipe(path, modality=modality)
+    if modality is None:
+        modality = cur_recipe.get_modality(path)
+        fix_modality = False
+    else:
+        fix_modality = True
+    if modality in data_classes_by_modality:
+        afm_data_class = data_classes_by_modality[modality]
+    else:
+        afm_data_class = default_data_classes_by_modality[modality]
+    return _iter_data(path,
+                      cur_recipe=cur_recipe,
+                      modality=modality,
+                      fix_modality=fix_modality,
+                      afm_data_class=afm_data_class,
+                      meta_override=meta_override,
+                      diskcache=diskcache,
+                      callback=callback)
 
 
 def register_format(recipe):
@@ -270,14 +309,10 @@ def register_format(recipe):
     afr = AFMFormatRecipe(recipe)
     formats_available.append(afr)
     # suffix
-    if afr.suffix not in formats_by_suffix:
-        formats_by_suffix[afr.suffix] = []
-    formats_by_suffix[afr.suffix].append(afr)
+    _formats_by_suffix.setdefault(afr.suffix, []).append(afr)
     # modality
     for modality in afr.modalities:
-        if modality not in formats_by_modality:
-            formats_by_modality[modality] = []
-        formats_by_modality[modality].append(afr)
+        _formats_by_modality.setdefault(modality, []).append(afr)
     # supported extensions
     if afr.suffix not in supported_extensions:  # avoid duplicates
         supported_extensions.append(afr.suffix)
@@ -293,11 +328,17 @@ default_data_classes_by_modality = {
 #: available/supported file formats
 formats_available = []
 
+# private, mutable registries (use :func:`register_format` to extend)
+_formats_by_suffix = {}
+_formats_by_modality = {}
+
 #: available file formats in a dictionary with suffix keys
-formats_by_suffix = {}
+#: (read-only view; updated through :func:`register_format`)
+formats_by_suffix = types.MappingProxyType(_formats_by_suffix)
 
 #: available file formats in a dictionary for each modality
-formats_by_modality = {}
+#: (read-only view; updated through :func:`register_format`)
+formats_by_modality = types.MappingProxyType(_formats_by_modality)
 
 #: list of supported extensions
 supported_extensions = []
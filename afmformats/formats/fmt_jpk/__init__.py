@@ -26,7 +26,7 @@ def detect(path):
     return valid
 
 
-def load_jpk(path, callback=None, meta_override=None):
+def load_jpk(path, callback=None, meta_override=None, prefetch=1):
     """Loads JPK Instruments data files
 
     These files are zip files containing java property files and
@@ -44,6 +44,11 @@ def load_jpk(path, callback=None, meta_override=None):
         if specified, contains key-value pairs of metadata that
         are used when loading the files
         (see :data:`afmformats.meta.META_FIELDS`)
+    prefetch: int
+        number of curves to read ahead asynchronously whenever the
+        data of a curve is accessed; this hides zip seek and
+        decompression latency behind the processing of the current
+        curve (set to 0 to disable)
     """
     if meta_override is None:
         meta_override = {}
@@ -64,7 +69,8 @@ def load_jpk(path, callback=None, meta_override=None):
             lazy_data.set_lazy_loader(column=column,
                                       func=jpkr.get_data,
                                       kwargs={"column": column,
-                                              "index": index})
+                                              "index": index,
+                                              "prefetch": prefetch})
         metadata = jpkr.get_metadata(index=index)
         metadata["z range"] = LazyMetaValue(
             lambda data: np.ptp(data["height (piezo)"]),
@@ -7,7 +7,9 @@ from ...errors import FileFormatMetaDataError
 
 __all__ = ["ReadJPKMetaKeyError",
            "get_primary_meta_recipe",
+           "get_primary_meta_recipe_items",
            "get_secondary_meta_recipe",
+           "get_secondary_meta_recipe_items",
            ]
 
 
@@ -23,9 +25,27 @@ def get_primary_meta_recipe():
     return meta_recipe_pri
 
 
+@functools.lru_cache()
+def get_primary_meta_recipe_items():
+    """Primary meta recipe compiled to a tuple of (key, variants)
+
+    This is the fast iteration variant of :func:`get_primary_meta_recipe`
+    used when building metadata for every segment of every curve.
+    """
+    return tuple((key, tuple(variants))
+                 for key, variants in get_primary_meta_recipe().items())
+
+
 @functools.lru_cache()
 def get_secondary_meta_recipe():
     with open(resource_filename("afmformats.formats.fmt_jpk",
                                 "jpk_meta_secondary.json")) as fd:
         meta_recipe_sec = json.load(fd)
     return meta_recipe_sec
+
+
+@functools.lru_cache()
+def get_secondary_meta_recipe_items():
+    """Secondary meta recipe compiled to a tuple of (key, variants)"""
+    return tuple((key, tuple(variants))
+                 for key, variants in get_secondary_meta_recipe().items())
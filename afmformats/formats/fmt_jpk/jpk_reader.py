@@ -1,6 +1,10 @@
 from collections import OrderedDict
-import copy
+from concurrent.futures import ThreadPoolExecutor
 import functools
+import io
+import math
+import re
+import threading
 import zipfile
 
 import jprops
@@ -14,6 +18,142 @@ from . import jpk_data, jpk_meta
 __all__ = ["ArchiveCache", "JPKReader"]
 
 
+try:
+    cached_property = functools.cached_property
+except AttributeError:  # Python 3.6/3.7
+    class cached_property(object):
+        """Minimal backport of functools.cached_property (Python 3.8)
+
+        Computes the value on first access and stores it in the
+        instance dict, where subsequent attribute lookups find it
+        without calling the function again.
+        """
+
+        def __init__(self, func):
+            self.func = func
+            self.attrname = None
+            self.__doc__ = func.__doc__
+
+        def __set_name__(self, owner, name):
+            self.attrname = name
+
+        def __get__(self, instance, owner=None):
+            if instance is None:
+                return self
+            value = self.func(instance)
+            instance.__dict__[self.attrname] = value
+            return value
+
+
+#: Executor shared by all readers for asynchronous readahead of
+#: segment data (threads are only spawned on first use)
+_prefetch_executor = ThreadPoolExecutor(max_workers=2,
+                                        thread_name_prefix="jpk_prefetch")
+
+
+#: First characters of strings that could represent a number,
+#: including "nan"/"NaN" and "inf"/"Infinity" with an optional sign
+#: (Java's Double.toString emits e.g. "-Infinity")
+_NUMERIC_RE = re.compile(r"^[+-]?[.\dnNiI]")
+
+#: Java property escape sequences (e.g. "\:" in time stamps)
+_ESCAPE_RE = re.compile(r"\\(u[0-9a-fA-F]{4}|.)")
+_ESCAPE_MAP = {"t": "\t", "n": "\n", "r": "\r", "f": "\f"}
+
+
+def _unescape(value):
+    """Resolve Java property escape sequences in a string"""
+    def sub(mo):
+        esc = mo.group(1)
+        if esc.startswith("u"):
+            return chr(int(esc[1:], 16))
+        return _ESCAPE_MAP.get(esc, esc)
+    return _ESCAPE_RE.sub(sub, value)
+
+
+def _fast_jprops(fd):
+    """Fast parser for plain `key=value` Java property files
+
+    JPK header files normally only contain simple `key=value` lines,
+    for which the full escape handling of :func:`jprops.load_properties`
+    is unnecessary overhead. If a line continuation (backslash at the
+    end of a line) is detected, this function falls back to `jprops`.
+    """
+    data = fd.read()
+    props = {}
+    for line in data.decode("latin-1").splitlines():
+        line = line.strip()
+        if not line or line[0] in "#!":
+            continue
+        if line.endswith("\\"):
+            # line continuation; delegate to the full parser
+            return jprops.load_properties(io.BytesIO(data))
+        key, _, value = line.partition("=")
+        value = value.strip()
+        if "\\" in value:
+            value = _unescape(value)
+        props[key.strip()] = value
+    return props
+
+
+class _SharedProps:
+    """Lazily-parsed view of "shared-data/header.properties"
+
+    The shared properties file can be large while only a handful of
+    lcd-info entries are actually referenced per segment. This class
+    groups the raw lines by their "mediator.pindex" prefix in a single
+    pass and only parses (strips/unescapes) the lines of a prefix when
+    it is first requested via :func:`get`.
+    """
+
+    def __init__(self, data):
+        #: raw (suffix, value) pairs grouped by prefix
+        self._lines = {}
+        #: parsed per-prefix dictionaries
+        self._parsed = {}
+        for line in data.decode("latin-1").splitlines():
+            line = line.strip()
+            if not line or line[0] in "#!":
+                continue
+            if line.endswith("\\"):
+                # line continuations; index the fully-parsed properties
+                self._lines.clear()
+                self._parsed.clear()
+                props = jprops.load_properties(io.BytesIO(data))
+                for key, value in props.items():
+                    i2 = key.find(".", key.find(".") + 1)
+                    if i2 > 0:
+                        self._parsed.setdefault(
+                            key[:i2], {})[key[i2 + 1:]] = value
+                return
+            key, _, value = line.partition("=")
+            key = key.strip()
+            i1 = key.find(".")
+            i2 = key.find(".", i1 + 1)
+            if i1 < 0 or i2 < 0:
+                continue
+            self._lines.setdefault(key[:i2], []).append((key[i2 + 1:], value))
+
+    def get(self, prefix, default=None):
+        """Return the dict of property suffixes for a prefix
+
+        E.g. ``get("lcd-info.3")`` returns a dict of all property
+        suffixes (and values) whose keys start with "lcd-info.3.".
+        """
+        if prefix not in self._parsed:
+            lines = self._lines.get(prefix)
+            if lines is None:
+                return default
+            props = {}
+            for var, value in lines:
+                value = value.strip()
+                if "\\" in value:
+                    value = _unescape(value)
+                props[var] = value
+            self._parsed[prefix] = props
+        return self._parsed[prefix]
+
+
 class ArchiveCache:
     """Archive cache for fast access to zip data
 
@@ -31,21 +171,22 @@ class ArchiveCache:
     """
     open_archives = OrderedDict()
     max_archives = 32
+    _lock = threading.Lock()
 
     @staticmethod
     def get(zip_path):
         """Return the (possibly cached) `ZipFile` object for `zip_path`"""
-        if zip_path in ArchiveCache.open_archives:
-            arc = ArchiveCache.open_archives.pop(zip_path)
-        else:
-            arc = zipfile.ZipFile(zip_path, mode="r")
-        ArchiveCache.open_archives[zip_path] = arc
-        # remove any open archives
-        too_many = len(ArchiveCache.open_archives) - ArchiveCache.max_archives
-        if too_many > 0:
-            to_remove = list(ArchiveCache.open_archives.keys())[:too_many]
-            for key in to_remove:
-                old_arc = ArchiveCache.open_archives.pop(key)
+        cls = ArchiveCache
+        with cls._lock:
+            if zip_path in cls.open_archives:
+                arc = cls.open_archives[zip_path]
+                cls.open_archives.move_to_end(zip_path)
+            else:
+                arc = zipfile.ZipFile(zip_path, mode="r")
+                cls.open_archives[zip_path] = arc
+            # remove archives that were used least
+            while len(cls.open_archives) > cls.max_archives:
+                _, old_arc = cls.open_archives.popitem(last=False)
                 old_arc.close()
         return arc
 
@@ -54,66 +195,100 @@ class JPKReader(object):
     def __init__(self, path):
         self.path = path
 
-    @functools.lru_cache()
     def __len__(self):
         return len(self.get_index_numbers())
 
-    @property
-    @functools.lru_cache()
+    @cached_property
     def files(self):
         """List of files and folders in the archive"""
         arc = ArchiveCache.get(self.path)
         nlist = arc.namelist()
-        maxdigits = int(np.ceil(np.log10(len(nlist)))) + 1
-        repstr = "{:0" + "{}".format(maxdigits) + "d}"
+        # zero-padding width (enum components are bounded by the
+        # number of files)
+        maxdigits = len(str(len(nlist)))
 
         def sortkey(x):
             if x.count("/"):
                 xs = x.split("/")
                 for ii in range(len(xs)):
-                    if xs[ii].isnumeric():
-                        xs[ii] = repstr.format(int(xs[ii]))
+                    if xs[ii].isdigit():
+                        xs[ii] = f"{int(xs[ii]):0{maxdigits}d}"
                 return "/".join(xs)
             else:
                 return x
 
-        return sorted(nlist, key=sortkey)
-
-    @property
-    @functools.lru_cache()
+        nlist = sorted(nlist, key=sortkey)
+        # Build lookup tables for fast access (O(1) membership tests
+        # and per-segment file listings instead of repeated scans of
+        # the full name list).
+        self._files_set = frozenset(nlist)
+        # Cache the ZipInfo instances from the central directory, so
+        # that `arc.open` does not have to resolve names to archive
+        # offsets for every read.
+        self._zinfo = {zi.filename: zi for zi in arc.infolist()}
+        self._files_by_segment = {}
+        for ff in nlist:
+            ii = ff.find("segments/")
+            if ii >= 0:
+                jj = ff.find("/", ii + len("segments/"))
+                if jj >= 0:
+                    # e.g. "index/0/segments/1" or "segments/1"
+                    self._files_by_segment.setdefault(ff[:jj], []).append(ff)
+        # Extract the available segment numbers for each curve enum in
+        # the same pass (avoids probing the archive with try/except in
+        # `get_index_segment_numbers`).
+        self._segments_by_index = {}
+        for key in self._files_by_segment:
+            if key.startswith("index/"):
+                enum = int(key.split("/", 2)[1])
+            else:
+                enum = 0
+            seg = int(key.rsplit("/", 1)[1])
+            self._segments_by_index.setdefault(enum, []).append(seg)
+        for segs in self._segments_by_index.values():
+            segs.sort()
+        return nlist
+
+    @cached_property
     def hierarchy(self):
         """Format hierarchy ("single" or "indexed")"""
-        if "segments/" in self.files:
+        self.files  # make sure the lookup tables exist
+        if "segments/" in self._files_set:
             return "single"
-        elif "index/" in self.files:
+        elif "index/" in self._files_set:
             return "indexed"
         else:
             msg = "Cannot determine hierarchy: {}".format(self.path)
             raise NotImplementedError(msg)
 
-    @property
-    @functools.lru_cache()
+    @cached_property
     def _properties_general(self):
         """Return content of "header.properties"""
+        self.files  # make sure the lookup tables exist
         arc = ArchiveCache.get(self.path)
-        with arc.open("header.properties", "r") as fd:
-            props = jprops.load_properties(fd)
+        with arc.open(self._zinfo["header.properties"], "r") as fd:
+            props = _fast_jprops(fd)
         return props
 
-    @property
-    @functools.lru_cache()
-    def _properties_shared(self):
-        """Return content of "shared-data/header.properties"""
+    @cached_property
+    def _properties_shared_index(self):
+        """Shared properties indexed by their "mediator.pindex" prefix
+
+        The returned :class:`_SharedProps` maps e.g. "lcd-info.3" to a
+        dict of all property suffixes (and values) that start with
+        "lcd-info.3.". This turns the per-segment lcd-info substitution
+        into a single dict lookup instead of a scan over all shared
+        properties, and only the referenced prefixes are ever parsed.
+        """
         path = "shared-data/header.properties"
         if path in self.files:
             arc = ArchiveCache.get(self.path)
-            with arc.open(path, "r") as fd:
-                props = jprops.load_properties(fd)
+            data = arc.read(self._zinfo[path])
         else:
-            props = {}
-        return props
+            data = b""
+        return _SharedProps(data)
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=1024)
     def _get_index_segment_properties(self, index, segment):
         """Return properties fro a specific index and segment
 
@@ -128,59 +303,95 @@ class JPKReader(object):
         # 1. Properties of index
         p_index = self.get_index_path(index) + "header.properties"
         arc = ArchiveCache.get(self.path)
-        with arc.open(p_index, "r") as fd:
-            prop = jprops.load_properties(fd)
+        with arc.open(self._zinfo[p_index], "r") as fd:
+            prop = _fast_jprops(fd)
 
         # 2. Properties of segment (if applicable)
         if segment is not None:
             p_segment = self.get_index_segment_path(index, segment) \
                         + "segment-header.properties"
-            with arc.open(p_segment, "r") as fd:
-                prop.update(jprops.load_properties(fd))
+            with arc.open(self._zinfo[p_segment], "r") as fd:
+                prop.update(_fast_jprops(fd))
 
         # 3. Substitute shared properties
-        psprop = self._properties_shared
-        # Generate lists of keys and sort them for easier debugging.
+        shared_index = self._properties_shared_index
+        # Generate a list of keys and sort it for easier debugging.
         proplist = list(prop.keys())
         proplist.sort()
-        pslist = list(psprop.keys())
-        pslist.sort()
         # Loop through the segment data and search for lcd-info tags
         for key in proplist:
             # Get line channel data
-            if key.count(".*"):
+            if ".*" in key:
                 # Replace the lcd-info tag by the values in the shared
                 # properties file:
                 # 0, 1, 2, 3, etc.
                 pindex = prop[key]
+                # locate the two last dots to slice out the components
+                # without allocating intermediate lists
+                i2 = key.rfind(".")
+                i1 = key.rfind(".", 0, i2)
                 # lcd-info, force-segment-header-info
-                mediator = ".".join(key.split(".")[-2:-1])
+                mediator = key[i1 + 1:i2]
                 # channel.vDeflection, force-segment-header
-                headkey = key.rsplit(".", 2)[0]
-                # append a "." here to make sure
-                # not to confuse "1" with "10".
-                startid = "{}.{}.".format(mediator, pindex)
-                for k2 in pslist:
-                    if k2.startswith(startid):
-                        var = ".".join(k2.split(".")[2:])
-                        prop[".".join([headkey, var])] = psprop[k2]
+                headkey = key[:i1]
+                # prefix lookup instead of scanning all shared keys
+                # ("mediator.pindex" cannot confuse "1" with "10")
+                startid = mediator + "." + pindex
+                for var, value in shared_index.get(startid, {}).items():
+                    prop[headkey + "." + var] = value
 
         # 4. Update with general properties
         # (for "single" hierarchy, this coincides with index properties)
         prop.update(self._properties_general)
 
         # 5. Try to convert numbers to floats and remove NaNs
-        for p in list(prop.keys()):
-            try:
-                prop[p] = float(prop[p])
-            except BaseException:
-                pass
-            else:
-                if np.isnan(prop[p]):
-                    prop.pop(p)
+        # (cheap pre-filter, so that most non-numeric strings do not
+        # pay for an exception)
+        for p, v in list(prop.items()):
+            if isinstance(v, str) and _NUMERIC_RE.match(v):
+                try:
+                    fv = float(v)
+                except ValueError:
+                    pass
+                else:
+                    if math.isnan(fv):
+                        prop.pop(p)
+                    else:
+                        prop[p] = fv
         return prop
 
-    def get_data(self, column, index, segment=None):
+    @functools.lru_cache(maxsize=8)
+    def _read_segment_dats(self, index, segment):
+        """Read all binary .dat files of a segment in one go
+
+        Returns a dict mapping each .dat path within the archive to its
+        raw (undecoded) content. Reading the whole segment at once
+        amortizes the per-file zip bookkeeping when several columns of
+        the same segment are accessed in a row (which is what
+        :func:`load_jpk` does).
+        """
+        p_seg = self.get_index_segment_path(index, segment)
+        arc = ArchiveCache.get(self.path)
+        blobs = {}
+        for ff in self._files_by_segment.get(p_seg.rstrip("/"), []):
+            if ff.endswith(".dat"):
+                blobs[ff] = arc.read(self._zinfo[ff])
+        return blobs
+
+    def prefetch(self, index, count=1):
+        """Asynchronously read segment data of upcoming curves
+
+        Submits background reads (via :func:`_read_segment_dats`) for
+        the curves `index` to `index + count - 1`, so that their data
+        are already in memory when they are accessed. This overlaps
+        zip seek/decompression latency with the processing of the
+        current curve.
+        """
+        for idx in range(index, min(index + count, len(self))):
+            for seg in self.get_index_segment_numbers(idx):
+                _prefetch_executor.submit(self._read_segment_dats, idx, seg)
+
+    def get_data(self, column, index, segment=None, prefetch=0):
         """Return data for a given column, index, or segment
 
         Parameters
@@ -191,6 +402,9 @@ class JPKReader(object):
             Curve index in the current archive
         segment: int or None
             Segment index for chosen curve index
+        prefetch: int
+            Number of curves after `index` whose data should be
+            read-ahead asynchronously (see :func:`prefetch`)
 
         Returns
         -------
@@ -198,7 +412,31 @@ class JPKReader(object):
             Column data
         """
         numsegs = self.get_index_segment_numbers(index)
+        if prefetch:
+            self.prefetch(index + 1, count=prefetch)
         if segment is None:
+            if column in ["time", "segment"]:
+                # These columns are generated (not read from disk), so
+                # we can fill one preallocated array instead of
+                # concatenating per-segment arrays.
+                counts = [self.get_metadata(index, seg)["point count"]
+                          for seg in numsegs]
+                offsets = np.cumsum([0] + counts)
+                if column == "time":
+                    out = np.empty(offsets[-1], dtype=float)
+                    start = 0
+                    for ii, seg in enumerate(numsegs):
+                        duration = self.get_metadata(index, seg)["duration"]
+                        out[offsets[ii]:offsets[ii + 1]] = np.linspace(
+                            start, start + duration, counts[ii],
+                            endpoint=False)
+                        start += duration
+                else:
+                    dtype = bool if len(numsegs) <= 2 else np.uint8
+                    out = np.empty(offsets[-1], dtype=dtype)
+                    for ii, seg in enumerate(numsegs):
+                        out[offsets[ii]:offsets[ii + 1]] = dtype(seg)
+                return out
             # Return concatenated data for all segments
             data = []
             for seg in numsegs:
@@ -224,31 +462,26 @@ class JPKReader(object):
                 dtype = bool
             else:
                 dtype = np.uint8
-            return np.ones(md["point count"], dtype=dtype) * dtype(segment)
+            return np.full(md["point count"], segment, dtype=dtype)
         else:
             # get the segment's data list
             p_seg = self.get_index_segment_path(index, segment)
-            loc_list = [ff for ff in self.files if ff.count(p_seg)]
+            loc_list = self._files_by_segment.get(p_seg.rstrip("/"), [])
             name, slot, dat = jpk_data.find_column_dat(loc_list, column)
-            arc = ArchiveCache.get(self.path)
-            with arc.open(dat, "r") as fd:
-                data, unit, _ = jpk_data.load_dat_unit(fd, name=name,
-                                                       properties=prop,
-                                                       slot=slot)
+            blob = self._read_segment_dats(index, segment)[dat]
+            data, unit, _ = jpk_data.load_dat_unit(io.BytesIO(blob),
+                                                   name=name,
+                                                   properties=prop,
+                                                   slot=slot)
             # verify unit
             if unit != jpk_data.JPK_UNITS[column]:
                 raise jpk_data.ReadJPKError("Unknown unit for {}: {}".format(
                     column, unit))
             return data
 
-    @functools.lru_cache()
-    def get_index_numbers(self):
-        """Return int array with available index numbers
-
-        The numbers is what we refer to as "enum" in afmformats.
-        Sometimes individual curves are missing from JPK files.
-        These have to be correctly indexed.
-        """
+    @cached_property
+    def _index_numbers(self):
+        """Int array with available index numbers (read-only)"""
         indices = []
         if self.hierarchy == "single":
             indices.append(0)
@@ -260,56 +493,68 @@ class JPKReader(object):
                         and ff.endswith("/")):
                     indices.append(int(ff.split("/")[1]))
         indices = np.array(indices, dtype=int)
+        indices.setflags(write=False)
         return indices
 
-    @functools.lru_cache()
-    def get_index_path(self, index):
-        """Return the path in the zip file for a specific curve index"""
-        enum = self.get_index_numbers()[index]
+    def get_index_numbers(self):
+        """Return int array with available index numbers
+
+        The numbers is what we refer to as "enum" in afmformats.
+        Sometimes individual curves are missing from JPK files.
+        These have to be correctly indexed.
+        """
+        return self._index_numbers
+
+    @cached_property
+    def _index_paths(self):
+        """Archive paths for all curve indices"""
         if self.hierarchy == "single":
-            path = ""
+            return [""] * len(self)
         elif self.hierarchy == "indexed":
-            path = "index/{}/".format(enum)
+            return ["index/{}/".format(enum)
+                    for enum in self.get_index_numbers()]
         else:
             raise NotImplementedError("No rule to get path for hierarchy "
                                       + "'{}'!".format(self.hierarchy))
-        if path and path not in self.files:
-            raise IndexError("Cannot find path for index '{}' ".format(index)
-                             + " (enum '{}')!".format(enum))
-        return path
 
-    @functools.lru_cache()
+    @cached_property
+    def _segment_paths(self):
+        """Archive paths for all (curve index, segment) combinations"""
+        single = self.hierarchy == "single"
+        paths = {}
+        for ii, enum in enumerate(self.get_index_numbers()):
+            for seg in self._segments_by_index.get(int(enum), []):
+                if single:
+                    paths[(ii, seg)] = "segments/{}/".format(seg)
+                else:
+                    paths[(ii, seg)] = "index/{}/segments/{}/".format(enum,
+                                                                      seg)
+        return paths
+
+    def get_index_path(self, index):
+        """Return the path in the zip file for a specific curve index"""
+        try:
+            return self._index_paths[index]
+        except IndexError:
+            raise IndexError(
+                "Cannot find path for index '{}'!".format(index))
+
+    @functools.lru_cache(maxsize=1024)
     def get_index_segment_numbers(self, index):
         """Return available segment numbers for an index"""
-        segments = []
-        seg = 0
-        while True:
-            try:
-                self.get_index_segment_path(index, seg)
-            except IndexError:
-                break
-            else:
-                segments.append(seg)
-                seg += 1
-        return segments
+        self.files  # make sure the lookup tables exist
+        enum = int(self.get_index_numbers()[index])
+        return self._segments_by_index.get(enum, [])
 
-    @functools.lru_cache()
     def get_index_segment_path(self, index, segment):
         """Return the path in the zip file for a specific index and segment"""
-        enum = self.get_index_numbers()[index]
-        if self.hierarchy == "single":
-            path = "segments/{}/".format(segment)
-        elif self.hierarchy == "indexed":
-            path = "index/{}/segments/{}/".format(enum, segment)
-        else:
-            raise NotImplementedError("No rule to get path for hierarchy "
-                                      + "'{}'!".format(self.hierarchy))
-        if path not in self.files:
+        try:
+            return self._segment_paths[(index, segment)]
+        except KeyError:
             raise IndexError("Cannot find path for index '{}' ".format(index)
-                             + "(enum '{}')".format(enum))
-        return path
+                             + "and segment '{}'!".format(segment))
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=1024)
     def get_metadata(self, index, segment=None):
         """Return the metadata for a specific index and segment
 
@@ -325,7 +570,9 @@ class JPKReader(object):
             md = meta.MetaData()
             # reverse order, because we want "time" from first md
             for seg in self.get_index_segment_numbers(index)[::-1]:
-                mdap = copy.deepcopy(self.get_metadata(index, seg))
+                # Shallow copy is enough here; the values are immutable
+                # (and `MetaData.copy` does not copy `LazyMetaValue`).
+                mdap = self.get_metadata(index, seg).copy()
                 if "duration" in md:
                     md["duration"] += mdap.pop("duration")
                 if "point count" in md:
@@ -335,9 +582,8 @@ class JPKReader(object):
         prop = self._get_index_segment_properties(index=index, segment=segment)
         # 1. Populate with primary metadata
         md = meta.MetaData()
-        recipe = jpk_meta.get_primary_meta_recipe()
-        for key in recipe:
-            for vari in recipe[key]:
+        for key, variants in jpk_meta.get_primary_meta_recipe_items():
+            for vari in variants:
                 if vari in prop:
                     md[key] = prop[vari]
                     break
@@ -354,11 +600,9 @@ class JPKReader(object):
         md["path"] = self.path
 
         # 2. Populate with secondary metadata
-        recipe_2 = jpk_meta.get_secondary_meta_recipe()
         md_im = {}
-
-        for key in recipe_2:
-            for vari in recipe_2[key]:
+        for key, variants in jpk_meta.get_secondary_meta_recipe_items():
+            for vari in variants:
                 if vari in prop:
                     md_im[key] = prop[vari]
                     break
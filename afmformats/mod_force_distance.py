@@ -10,6 +10,11 @@ class AFMForceDistance(AFMData):
     A force-distance dataset consists of an approach and
     a retract curve.
     """
+    def __init__(self, *args, **kwargs):
+        super(AFMForceDistance, self).__init__(*args, **kwargs)
+        # cached boolean masks for the approach/retract segments
+        self._segment_masks = {}
+
     def __setitem__(self, key, values):
         if len(values) != len(self):
             raise ValueError(
@@ -17,11 +22,27 @@ class AFMForceDistance(AFMData):
                 + f"for AFMForceDistance of length '{len(self)}'!")
         # do not touch raw data
         self._data[key] = values
+        if key == "segment":
+            # cached segment masks are no longer valid
+            self._segment_masks.clear()
+
+    def _get_segment_mask(self, idx):
+        """Return (and cache) the boolean mask for a segment index"""
+        if idx not in self._segment_masks:
+            if "segment" in self._raw_data:
+                segdata = self._raw_data["segment"]
+            elif "segment" in self._data:
+                segdata = self._data["segment"]
+            else:
+                raise ValueError("Could not identify segment data!")
+            self._segment_masks[idx] = segdata == idx
+        return self._segment_masks[idx]
 
     @property
     def appr(self):
         """Dictionary-like interface to the approach segment"""
-        return Segment(self._raw_data, self._data, which="approach")
+        return Segment(self._raw_data, self._data, which="approach",
+                       segment_index=self._get_segment_mask(False))
 
     @property
     def modality(self):
@@ -31,13 +52,14 @@ class AFMForceDistance(AFMData):
     @property
     def retr(self):
         """Dictionary-like interface to the retract segment"""
-        return Segment(self._raw_data, self._data, which="retract")
+        return Segment(self._raw_data, self._data, which="retract",
+                       segment_index=self._get_segment_mask(True))
 
 
 class Segment(object):
     """Simple wrapper around dict-like `data` to expose a single segment"""
 
-    def __init__(self, raw_data, data, which="approach"):
+    def __init__(self, raw_data, data, which="approach", segment_index=None):
         if which not in ["approach", "retract"]:
             raise ValueError("`which` must be 'approach' or 'retract', "
                              + "got '{}'!".format(which))
@@ -51,7 +73,9 @@ class Segment(object):
         self.data = data
 
         # determine segment
-        if "segment" in raw_data:
+        if segment_index is not None:
+            self.segment_index = segment_index
+        elif "segment" in raw_data:
             self.segment_index = raw_data["segment"] == self.idx
         elif "segment" in data:
             self.segment_index = data["segment"] == self.idx
@@ -62,6 +86,8 @@ class Segment(object):
         if key in self.data:
             return self.data[key][self.segment_index]
         elif key in self.raw_data:
-            return self.raw_data[key][self.segment_index].copy()
+            # boolean indexing already returns a new array (do not
+            # modify it in-place anyway)
+            return self.raw_data[key][self.segment_index]
         else:
             raise KeyError("Undefined feature '{}'!".format(key))
@@ -1,5 +1,6 @@
 import pathlib
 
+import numpy as np
 import pytest
 
 import afmformats
@@ -9,6 +10,23 @@ import afmformats.errors
 data_path = pathlib.Path(__file__).parent / "data"
 
 
+def test_load_data_iter():
+    """`load_data_iter` must yield the same curves as `load_data`"""
+    path = data_path / "fmt-jpk-fd_map2x2_extracted.jpk-force-map"
+    afmlist = afmformats.load_data(path=path)
+    curves = list(afmformats.load_data_iter(path=path))
+    assert len(curves) == len(afmlist) == 4
+    for ds1, ds2 in zip(afmlist, curves):
+        assert ds1.metadata["curve id"] == ds2.metadata["curve id"]
+        assert np.allclose(ds1["force"], ds2["force"])
+
+
+def test_load_data_iter_invalid_extension():
+    """The unsupported-extension error must be raised eagerly"""
+    with pytest.raises(ValueError, match="Unsupported file extension"):
+        afmformats.load_data_iter(data_path / "does-not-exist.xyz")
+
+
 @pytest.mark.parametrize("path", data_path.glob("fmt-*-fd_*"))
 def test_load_force_distance_with_callback(path):
     """Make sure that the callback function is properly implemented"""
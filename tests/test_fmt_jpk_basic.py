@@ -2,6 +2,7 @@
 import pathlib
 import shutil
 import tempfile
+import threading
 
 import numpy as np
 import pytest
@@ -9,7 +10,7 @@ import pytest
 import afmformats
 import afmformats.errors
 
-from afmformats.formats.fmt_jpk.jpk_reader import ArchiveCache
+from afmformats.formats.fmt_jpk.jpk_reader import ArchiveCache, JPKReader
 
 
 data_path = pathlib.Path(__file__).resolve().parent / "data"
@@ -27,6 +28,33 @@ def test_archive_cache():
     assert not ziplist[-1].fp is None
 
 
+def test_archive_cache_threaded():
+    """Concurrent access must neither fail nor overfill the cache"""
+    td = pathlib.Path(tempfile.mkdtemp(prefix="archive_cache_jpk_mt_"))
+    paths = []
+    for ii in range(ArchiveCache.max_archives + 5):
+        pnew = td / f"spot_{ii:03d}.jpk-force"
+        shutil.copy2(data_path / "fmt-jpk-fd_spot3-0192.jpk-force", pnew)
+        paths.append(pnew)
+    errors = []
+
+    def run():
+        try:
+            for pp in paths:
+                arc = ArchiveCache.get(pp)
+                arc.namelist()
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert not errors
+    assert len(ArchiveCache.open_archives) <= ArchiveCache.max_archives
+
+
 def test_creep_compliance1():
     jpkfile = data_path / "fmt-jpk-cc_pr14-brain-2021.06.30.jpk-force"
     ds = afmformats.load_data(path=jpkfile)[0]
@@ -89,6 +117,18 @@ def test_load_jpk_simple():
     assert np.allclose(ds["height (measured)"][0], 2.2815672438768612e-05)
 
 
+def test_load_jpk_map_prefetch():
+    """Data loaded with readahead must match the direct read"""
+    jpkfile = data_path / "fmt-jpk-fd_map2x2_extracted.jpk-force-map"
+    jpkr1 = JPKReader(jpkfile)
+    jpkr2 = JPKReader(jpkfile)
+    for index in range(len(jpkr1)):
+        for column in ["force", "height (piezo)", "segment", "time"]:
+            assert np.allclose(
+                jpkr1.get_data(column, index),
+                jpkr2.get_data(column, index, prefetch=2))
+
+
 def test_load_jpk_piezo():
     jpkfile = data_path / "fmt-jpk-fd_spot3-0192.jpk-force"
     afmlist = afmformats.load_data(path=jpkfile)
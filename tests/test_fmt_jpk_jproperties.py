@@ -1,15 +1,48 @@
 """Test of basic opening functionalities"""
+import io
 import pathlib
+import zipfile
 
+import jprops
 import numpy as np
 
 import afmformats
 from afmformats.formats.fmt_jpk import JPKReader
+from afmformats.formats.fmt_jpk.jpk_reader import _fast_jprops
 
 
 data_path = pathlib.Path(__file__).resolve().parent / "data"
 
 
+def test_fast_jprops_escapes():
+    """In-line escape sequences must be resolved like jprops does"""
+    data = b"force-segment-header.time-stamp=2015-05-22 15\\:31\\:49\n" \
+           b"unit.unit=\\u00B5m\n"
+    props = _fast_jprops(io.BytesIO(data))
+    assert props == jprops.load_properties(io.BytesIO(data))
+    assert props["force-segment-header.time-stamp"] == "2015-05-22 15:31:49"
+    assert props["unit.unit"] == "\u00B5m"
+
+
+def test_fast_jprops_line_continuation():
+    """Line continuations must fall back to the full jprops parser"""
+    data = b"key.a=hello \\\n    world\nkey.b=2\n"
+    props = _fast_jprops(io.BytesIO(data))
+    assert props == jprops.load_properties(io.BytesIO(data))
+    assert props["key.a"] == "hello world"
+
+
+def test_fast_jprops_matches_jprops_on_data():
+    """The fast parser must agree with jprops on all shipped headers"""
+    for path in data_path.glob("fmt-jpk-*"):
+        with zipfile.ZipFile(path) as arc:
+            for name in arc.namelist():
+                if name.endswith(".properties"):
+                    data = arc.read(name)
+                    assert _fast_jprops(io.BytesIO(data)) \
+                        == jprops.load_properties(io.BytesIO(data)), name
+
+
 def test_meta_extracted_map():
     jpkfile = data_path / "fmt-jpk-fd_map2x2_extracted.jpk-force-map"
     md = afmformats.load_data(jpkfile)[0].metadata